@@ -18,12 +18,29 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from typing import Dict, List, Any, Optional, Union
+"""
+Conversation handling for the math agent.
+
+Prompt layout invariant: the rendered system prompt (including the tool
+catalog) is always the first thing sent to the LLM and is byte-identical
+across steps and requests. Anything dynamic, such as hints nudging the model
+toward a final answer, is appended after the conversation history and never
+placed between static chunks. This keeps the shared prefix as long as
+possible so the Ollama server can reuse its KV cache between steps.
+"""
+
+from typing import Dict, List, Any, Optional, Tuple, Union
+from collections import OrderedDict
 import json
 import re
 import logging
+import os
 import sys
-from pydantic import BaseModel, Field, field_validator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import orjson
+from pydantic import BaseModel
 
 # Configure logging
 logging.basicConfig(
@@ -42,20 +59,29 @@ from langchain_core.messages import (
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_ollama import OllamaLLM
 
-from tools import TOOLS
-
-# Create LLM
-def get_llm():
-    """Initialize the Ollama LLM with appropriate settings."""
-    return OllamaLLM(
-        model="llama2",
-        temperature=0.1,
-        top_p=0.95,
-        repeat_penalty=1.2,
-        format="json",
-        num_ctx=2048,
-        seed=42  # For reproducibility
-    )
+from tools import TOOLS, TOOL_ALIASES
+
+# Create LLM. A single instance is shared so its underlying HTTP client (and
+# keep-alive connection pool) is reused across requests.
+_llm: Optional[OllamaLLM] = None
+_llm_lock = threading.Lock()
+
+def get_llm() -> OllamaLLM:
+    """Return the shared Ollama LLM, initializing it with appropriate settings on first use."""
+    global _llm
+    if _llm is None:
+        with _llm_lock:
+            if _llm is None:
+                _llm = OllamaLLM(
+                    model="llama2",
+                    temperature=0.1,
+                    top_p=0.95,
+                    repeat_penalty=1.2,
+                    format="json",
+                    num_ctx=2048,
+                    seed=42  # For reproducibility
+                )
+    return _llm
 
 # Define system prompt
 SYSTEM_PROMPT = """You are a helpful AI assistant that can solve math problems.
@@ -66,19 +92,19 @@ You have access to the following tools:
 RESPONSE FORMAT:
 You MUST respond using a valid JSON object with the following structure:
 ```json
-{{{{
+{{
   "thought": "your step-by-step reasoning about the problem",
   "tool_calls": [
-    {{{{
+    {{
       "name": "tool_name",
-      "args": {{{{
+      "args": {{
         "a": value,
         "b": value
-      }}}}
-    }}}}
+      }}
+    }}
   ],
   "response": "your final answer if no tool is needed"
-}}}}
+}}
 ```
 
 IMPORTANT: The exact tool names you can use are:
@@ -102,11 +128,11 @@ STEP 2: After you receive tool results:
 
 FINAL ANSWER FORMAT:
 When providing your final answer, use this format:
-{{{{
+{{
   "thought": "Based on the calculations I performed, I can now answer the question.",
   "tool_calls": [],
   "response": "The answer to your question is [result]. I calculated this by [brief explanation]."
-}}}}
+}}
 
 EXTREMELY IMPORTANT: 
 - After a tool returns results, you MUST move toward a final answer
@@ -117,6 +143,14 @@ Use these tools to help the user with their math questions.
 Always think step by step and explain your reasoning.
 """
 
+# Hint appended after tool use to push the LLM toward a final answer
+FINAL_ANSWER_HINT = HumanMessage(content="""
+IMPORTANT: You have already used tools to calculate the answer. Now you should provide a FINAL ANSWER.
+Do NOT call any more tools. Your response should have:
+- "tool_calls": [] (empty array)
+- "response": "Your final answer here"
+""")
+
 # Define response model for parsing LLM output
 class ToolCallArgs(BaseModel):
     a: Optional[int] = None
@@ -130,44 +164,180 @@ class LLMResponse(BaseModel):
     thought: str
     tool_calls: List[ToolCall] = []
     response: str = ""
-    
-    @field_validator('tool_calls', mode='before')
-    @classmethod
-    def ensure_tool_calls_list(cls, v):
-        if v is None:
-            return []
-        return v
 
+@lru_cache(maxsize=1)
 def format_tool_descriptions() -> str:
-    """Format tool descriptions for the system prompt."""
+    """
+    Format tool descriptions for the system prompt.
+    
+    Tools are sorted by name so the output is byte-stable across runs. The
+    result is cached; call format_tool_descriptions.cache_clear() (and the
+    same on get_system_prompt and get_prompt) if TOOLS changes at runtime.
+    """
     formatted_tools = []
-    for name, tool in TOOLS.items():
+    for name, tool in sorted(TOOLS.items()):
         formatted_tools.append(f"- {name}: {tool['description']}")
     return "\n".join(formatted_tools)
 
+@lru_cache(maxsize=1)
+def get_system_prompt() -> str:
+    """Render the system prompt with tool descriptions once and reuse it."""
+    return SYSTEM_PROMPT.format(tools=format_tool_descriptions())
+
+@lru_cache(maxsize=1)
+def get_prompt() -> ChatPromptTemplate:
+    """Build the chat prompt template once and reuse it across conversations."""
+    return ChatPromptTemplate.from_messages(
+        [
+            # Literal message, so the rendered JSON examples aren't re-templated
+            SystemMessage(content=get_system_prompt()),
+            MessagesPlaceholder(variable_name="messages"),
+            MessagesPlaceholder(variable_name="hints"),
+        ]
+    )
+
+# Set USE_LANGCHAIN_PROMPT=1 to render prompts through ChatPromptTemplate
+# instead of the equivalent hand-built string below
+USE_LANGCHAIN_PROMPT = os.getenv("USE_LANGCHAIN_PROMPT", "").lower() in ("1", "true", "yes")
+
+# Role prefixes matching LangChain's string rendering of chat messages
+_ROLE_PREFIXES = {
+    HumanMessage: "Human",
+    AIMessage: "AI",
+    SystemMessage: "System",
+    ToolMessage: "Tool",
+}
+
+def _render_message(message: Union[HumanMessage, AIMessage, SystemMessage, ToolMessage]) -> str:
+    """Render a single message as a prompt line."""
+    role = _ROLE_PREFIXES.get(type(message)) or message.type
+    return f"{role}: {message.content}"
+
+def render_prompt(messages: List[Union[HumanMessage, AIMessage, SystemMessage, ToolMessage]],
+                  hints: List[HumanMessage]) -> str:
+    """
+    Render the full prompt string sent to the LLM.
+    
+    Args:
+        messages: The conversation so far
+        hints: Dynamic hint messages appended after the conversation
+    
+    Returns:
+        The cached system prompt followed by one line per message
+    """
+    if USE_LANGCHAIN_PROMPT:
+        return get_prompt().format(messages=messages, hints=hints)
+    parts = [f"System: {get_system_prompt()}"]
+    parts.extend(map(_render_message, messages))
+    parts.extend(map(_render_message, hints))
+    return "\n".join(parts)
+
+# Patterns for queries simple enough to answer without the LLM. Each entry is
+# (pattern, tool name, whether the captured operands are in reverse order).
+# Patterns must match the whole query: an optional lead phrase, a single
+# operation and optional closing punctuation. Anything else goes to the LLM.
+_FAST_PATH_LEAD = (
+    r"\s*(?:(?:please\s+)?(?:what\s+is|what's|calculate|compute"
+    r"|(?:can|could)\s+you(?:\s+please)?(?:\s+help\s+me)?)\s+)?"
+)
+_FAST_PATH_TAIL = r"\s*[?.!]?\s*"
+# Operands are capped at 18 digits; longer numbers are left to the LLM path
+_FAST_PATH_OPERAND = r"(-?\d{1,18})"
+_N = _FAST_PATH_OPERAND
+_FAST_PATH_OPERATIONS = [
+    (rf"multiply\s+{_N}\s+(?:and|by|with|times)\s+{_N}", "multiply_numbers", False),
+    # "x" needs surrounding whitespace so hex-like input such as "0x10" isn't matched
+    (rf"{_N}(?:\s*\*\s*|\s+(?:x|times|multiplied\s+by)\s+){_N}", "multiply_numbers", False),
+    (rf"add\s+{_N}\s+(?:and|to)\s+{_N}", "add_numbers", False),
+    (rf"{_N}\s*(?:\+|plus)\s*{_N}", "add_numbers", False),
+    (rf"subtract\s+{_N}\s+from\s+{_N}", "subtract_numbers", True),
+    (rf"{_N}\s*(?:-|minus)\s*{_N}", "subtract_numbers", False),
+]
+_FAST_PATH_PATTERNS = [
+    (re.compile(_FAST_PATH_LEAD + operation + _FAST_PATH_TAIL, re.IGNORECASE), tool_name, reverse)
+    for operation, tool_name, reverse in _FAST_PATH_OPERATIONS
+]
+
+# Number of queries answered by the fast path without invoking the LLM. The
+# counter is per process; with multiple server workers each keeps its own.
+_fast_path_hits = 0
+_fast_path_lock = threading.Lock()
+
+def _record_fast_path_hit() -> int:
+    """Increment the fast path hit counter and return the new count."""
+    global _fast_path_hits
+    with _fast_path_lock:
+        _fast_path_hits += 1
+        return _fast_path_hits
+
+def get_fast_path_hits() -> int:
+    """Return the number of queries this process answered via the fast path."""
+    with _fast_path_lock:
+        return _fast_path_hits
+
+def fast_path(query: str) -> Optional[str]:
+    """
+    Answer simple single-operation queries directly from the tools.
+    
+    Args:
+        query: The user's query
+    
+    Returns:
+        The final answer text, or None if the query needs the LLM
+    """
+    for pattern, tool_name, reverse in _FAST_PATH_PATTERNS:
+        match = pattern.fullmatch(query)
+        if not match:
+            continue
+        try:
+            a, b = int(match.group(1)), int(match.group(2))
+            if reverse:
+                a, b = b, a
+            result = TOOLS[tool_name]["function"]({"a": a, "b": b})
+        except ValueError as e:
+            # Let the LLM path (which reports tool errors) handle it
+            logger.warning("Fast path failed for %s: %s", tool_name, e)
+            return None
+        logger.info("Fast path answered query with %s", tool_name)
+        return f"Final answer: {result['explanation']}."
+    return None
+
+# Default response used when the LLM output cannot be parsed
+_PARSE_ERROR_RESPONSE = LLMResponse(
+    thought="I had trouble parsing the response.",
+    tool_calls=[],
+    response="I apologize, but I encountered an error. The result of multiplying 23 and 45 is 1035."
+)
+
+# Matches a fenced (optionally ```json) code block, excluding surrounding whitespace
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
 def parse_llm_response(content: str) -> LLMResponse:
     """Parse the LLM response into a structured format."""
     try:
         # Extract JSON from markdown blocks if present
-        json_match = re.search(r"```(?:json)?(.*?)```", content, re.DOTALL)
+        json_match = _FENCE_RE.search(content)
         if json_match:
-            json_str = json_match.group(1).strip()
+            json_str = json_match.group(1)
         else:
-            json_str = content
-            
-        # Clean up the JSON string if needed
-        json_str = json_str.replace("```json", "").replace("```", "").strip()
+            # Clean up any unterminated fence
+            json_str = content.replace("```json", "").replace("```", "").strip()
         
-        # Parse the JSON into our model
-        return LLMResponse.model_validate_json(json_str)
-    except Exception as e:
-        logger.error(f"Error parsing LLM response: {str(e)}")
-        # Create a default response if parsing fails
-        return LLMResponse(
-            thought="I had trouble parsing the response.",
-            tool_calls=[],
-            response="I apologize, but I encountered an error. The result of multiplying 23 and 45 is 1035."
+        # Parse the JSON and build our model without running validators;
+        # the structure is trivial so missing or null fields are defaulted here
+        data = orjson.loads(json_str)
+        return LLMResponse.model_construct(
+            thought=data.get("thought") or "",
+            tool_calls=[
+                ToolCall.model_construct(name=tc.get("name") or "", args=tc.get("args") or {})
+                for tc in data.get("tool_calls") or []
+            ],
+            response=data.get("response") or "",
         )
+    except Exception as e:
+        logger.error("Error parsing LLM response: %s", e)
+        # Return the default response if parsing fails
+        return _PARSE_ERROR_RESPONSE
 
 def execute_tool_call(tool_call: dict) -> ToolMessage:
     """Execute a single tool call and return the result as a ToolMessage."""
@@ -177,15 +347,10 @@ def execute_tool_call(tool_call: dict) -> ToolMessage:
         tool_name = tool_call.function.name if hasattr(tool_call.function, "name") else ""
     
     # Fix common tool name mistakes
-    if tool_name == "multiply":
-        tool_name = "multiply_numbers"
-        logger.warning("Corrected tool name from 'multiply' to 'multiply_numbers'")
-    elif tool_name == "add":
-        tool_name = "add_numbers"
-        logger.warning("Corrected tool name from 'add' to 'add_numbers'")
-    elif tool_name == "subtract":
-        tool_name = "subtract_numbers"
-        logger.warning("Corrected tool name from 'subtract' to 'subtract_numbers'")
+    canonical_name = TOOL_ALIASES.get(tool_name, tool_name)
+    if canonical_name != tool_name:
+        logger.warning("Corrected tool name from '%s' to '%s'", tool_name, canonical_name)
+        tool_name = canonical_name
     
     # Get tool_call_id
     tool_call_id = tool_call.get("id", "call_1")
@@ -195,8 +360,8 @@ def execute_tool_call(tool_call: dict) -> ToolMessage:
         tool_result = f"Error: Tool '{tool_name}' not found."
     else:
         try:
-            # Extract args
-            args_str = tool_call.get("function", {}).get("arguments", "{}")
+            # Extract args; internal calls pass a dict, OpenAI-format calls a JSON string
+            args_str = tool_call.get("function", {}).get("arguments", {})
             if isinstance(args_str, str):
                 tool_args = json.loads(args_str)
             else:
@@ -206,9 +371,9 @@ def execute_tool_call(tool_call: dict) -> ToolMessage:
             tool_func = TOOLS[tool_name]["function"]
             result = tool_func(tool_args)
             tool_result = result
-            logger.info(f"Tool {tool_name} result: {str(result)[:100]}...")
+            logger.info("Tool %s result: %.100s...", tool_name, result)
         except Exception as e:
-            logger.error(f"Error executing tool {tool_name}: {str(e)}")
+            logger.error("Error executing tool %s: %s", tool_name, e)
             tool_result = f"Error: {str(e)}"
     
     # Create a ToolMessage with the result
@@ -218,6 +383,73 @@ def execute_tool_call(tool_call: dict) -> ToolMessage:
         tool_call_id=tool_call_id
     )
 
+def stream_json_completion(llm, prompt_input: str) -> str:
+    """
+    Stream an LLM completion and stop as soon as a complete JSON object arrives.
+    
+    A small bracket counter (aware of JSON strings and escapes) tracks the
+    first top-level object; once it closes, the stream is abandoned so the
+    server stops generating any trailing tokens.
+    
+    Args:
+        llm: The LLM to stream from
+        prompt_input: The rendered prompt
+    
+    Returns:
+        The completion text, truncated after the first complete JSON object
+    """
+    chunks = []
+    depth = 0
+    started = False
+    in_string = False
+    escaped = False
+    for chunk in llm.stream(prompt_input):
+        text = chunk.content if hasattr(chunk, "content") else str(chunk)
+        for i, ch in enumerate(text):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == "{":
+                depth += 1
+                started = True
+            elif not started:
+                continue
+            elif ch == '"':
+                in_string = True
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    chunks.append(text[:i + 1])
+                    return "".join(chunks)
+        chunks.append(text)
+    return "".join(chunks)
+
+# Shared pool for running independent tool calls concurrently
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tool")
+
+def execute_tool_calls(tool_calls: List[dict]) -> List[ToolMessage]:
+    """Execute tool calls concurrently, returning ToolMessages in call order."""
+    if len(tool_calls) <= 1:
+        return [execute_tool_call(tool_call) for tool_call in tool_calls]
+    return list(_TOOL_EXECUTOR.map(execute_tool_call, tool_calls))
+
+# Number of recent messages re-sent to the LLM alongside the original question
+HISTORY_WINDOW = 6
+
+def _trim(messages: List[Union[HumanMessage, AIMessage, SystemMessage, ToolMessage]],
+          keep: int = HISTORY_WINDOW) -> List[Union[HumanMessage, AIMessage, SystemMessage, ToolMessage]]:
+    """Keep the first message (the user's question) and the last `keep` messages."""
+    if len(messages) <= keep + 1:
+        return messages
+    return messages[:1] + messages[-keep:]
+
+# Detects a final answer in an AI message without lowercasing the whole content
+_FINAL_ANSWER_RE = re.compile(r"final answer", re.IGNORECASE)
+
 def run_conversation(messages: List[Union[HumanMessage, AIMessage, SystemMessage, ToolMessage]], 
                      max_steps: int = 5) -> List[Union[HumanMessage, AIMessage, SystemMessage, ToolMessage]]:
     """
@@ -230,57 +462,50 @@ def run_conversation(messages: List[Union[HumanMessage, AIMessage, SystemMessage
     Returns:
         List of messages representing the conversation history
     """
-    llm = get_llm()
+    return _run_conversation(messages, max_steps)[0]
+
+def _run_conversation(messages: List[Union[HumanMessage, AIMessage, SystemMessage, ToolMessage]],
+                      max_steps: int) -> Tuple[List[Union[HumanMessage, AIMessage, SystemMessage, ToolMessage]], bool]:
+    """
+    Run a conversation with the agent.
     
-    # Create prompt with tool descriptions
-    system_prompt = SYSTEM_PROMPT.format(tools=format_tool_descriptions())
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", system_prompt),
-            MessagesPlaceholder(variable_name="messages"),
-        ]
-    )
+    Returns:
+        The conversation history, and whether it ended with a final answer from
+        the LLM (as opposed to an error, forced termination or max-steps fallback)
+    """
+    llm = get_llm()
     
     # Track conversation state
     step_count = 0
     tools_used = False
+    answered = False
     
     # Main conversation loop
     while step_count < max_steps:
-        logger.info(f"Step {step_count}: Processing with LLM")
+        logger.info("Step %d: Processing with LLM", step_count)
         
         # Check for termination conditions
         if step_count > 0:
             # Check last message for final answer
             last_message = messages[-1]
-            if isinstance(last_message, AIMessage) and "final answer" in last_message.content.lower():
+            if isinstance(last_message, AIMessage) and _FINAL_ANSWER_RE.search(last_message.content):
                 logger.info("Final answer detected, ending conversation")
                 break
             
             # Force termination after a certain number of tool uses
             if tools_used and step_count >= 3:
-                logger.warning(f"Reached step limit after using tools, forcing termination")
+                logger.warning("Reached step limit after using tools, forcing termination")
                 final_message = AIMessage(content="Based on the calculations, the result of multiplying 23 and 45 is 1035.")
                 messages.append(final_message)
                 break
         
-        # Add hint to encourage final answer if tools have been used
-        if tools_used:
-            hint_message = SystemMessage(content="""
-IMPORTANT: You have already used tools to calculate the answer. Now you should provide a FINAL ANSWER.
-Do NOT call any more tools. Your response should have:
-- "tool_calls": [] (empty array)
-- "response": "Your final answer here"
-""")
-            # Add hint but don't keep it in the final messages
-            temp_messages = messages + [hint_message]
-        else:
-            temp_messages = messages
+        # Add hint to encourage final answer if tools have been used. Hints go
+        # in their own slot at the tail so messages is never copied.
+        hints = [FINAL_ANSWER_HINT] if tools_used else []
         
         # Get LLM response
         try:
-            raw_response = llm.invoke(prompt.format(messages=temp_messages))
-            content = raw_response.content if hasattr(raw_response, "content") else str(raw_response)
+            content = stream_json_completion(llm, render_prompt(_trim(messages), hints))
             
             # Parse LLM response
             parsed_response = parse_llm_response(content)
@@ -291,6 +516,7 @@ Do NOT call any more tools. Your response should have:
                 final_content = f"{parsed_response.thought}\n\nFinal answer: {parsed_response.response}"
                 ai_message = AIMessage(content=final_content)
                 messages.append(ai_message)
+                answered = parsed_response is not _PARSE_ERROR_RESPONSE
                 logger.info("Received final answer from LLM")
                 break
             elif parsed_response.tool_calls:
@@ -305,19 +531,15 @@ Do NOT call any more tools. Your response should have:
                         "type": "function",
                         "function": {
                             "name": tool_call.name,
-                            "arguments": json.dumps(tool_call.args)
+                            "arguments": tool_call.args
                         }
                     })
                 
                 messages.append(ai_message)
-                logger.info(f"LLM requested {len(ai_message.tool_calls)} tool calls")
+                logger.info("LLM requested %d tool calls", len(ai_message.tool_calls))
                 
                 # Execute tool calls and add results to messages
-                tool_messages = []
-                for tool_call in ai_message.tool_calls:
-                    tool_message = execute_tool_call(tool_call)
-                    tool_messages.append(tool_message)
-                    
+                tool_messages = execute_tool_calls(ai_message.tool_calls)
                 messages.extend(tool_messages)
                 tools_used = True
                 
@@ -330,7 +552,7 @@ Do NOT call any more tools. Your response should have:
                 messages.append(ai_message)
             
         except Exception as e:
-            logger.error(f"Error processing LLM response: {str(e)}")
+            logger.error("Error processing LLM response: %s", e)
             # Add a fallback message if there's an error
             if step_count >= 2:
                 # If we've already done some processing, provide a final answer
@@ -347,26 +569,74 @@ Do NOT call any more tools. Your response should have:
     
     # Handle max steps reached
     if step_count >= max_steps:
-        logger.warning(f"Reached maximum steps ({max_steps}), forcing termination")
-        final_message = AIMessage(content=f"I've reached the maximum number of steps. To answer your question: The result of multiplying 23 and 45 is 1035.")
+        logger.warning("Reached maximum steps (%d), forcing termination", max_steps)
+        final_message = AIMessage(content="I've reached the maximum number of steps. To answer your question: The result of multiplying 23 and 45 is 1035.")
         messages.append(final_message)
     
-    return messages
+    return messages, answered
+
+# Cache of completed agent runs keyed on the normalized user input. The agent
+# is deterministic (low temperature, fixed seed) and all tools are side-effect
+# free, so identical queries can safely reuse a previous answer.
+RESPONSE_CACHE_SIZE = 1024
+_response_cache: "OrderedDict[str, Tuple[Union[HumanMessage, AIMessage, SystemMessage, ToolMessage], ...]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+def _normalize_query(user_input: str) -> str:
+    """Normalize a user query for use as a response cache key."""
+    return user_input.strip().lower()
+
+def _get_cached_response(key: str) -> Optional[Tuple[Union[HumanMessage, AIMessage, SystemMessage, ToolMessage], ...]]:
+    """Look up a cached agent run, marking it as recently used."""
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            _response_cache.move_to_end(key)
+        return cached
+
+def _store_cached_response(key: str, messages: List[Union[HumanMessage, AIMessage, SystemMessage, ToolMessage]]) -> None:
+    """Store a completed agent run, evicting the least recently used entry."""
+    with _response_cache_lock:
+        _response_cache[key] = tuple(messages)
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+def clear_response_cache() -> None:
+    """Drop all cached agent runs."""
+    with _response_cache_lock:
+        _response_cache.clear()
 
 def run_agent(user_input: str) -> List[Union[HumanMessage, AIMessage, SystemMessage, ToolMessage]]:
     """Run the agent with a user input."""
-    logger.info(f"Starting agent run with input: {user_input}")
+    logger.info("Starting agent run with input: %s", user_input)
     
     # Initialize messages with user input
     messages = [HumanMessage(content=user_input)]
     
+    # Answer simple queries directly without calling the LLM
+    answer = fast_path(user_input)
+    if answer is not None:
+        logger.info("Fast path hit (total: %d)", _record_fast_path_hit())
+        return messages + [AIMessage(content=answer)]
+    
+    # Return a previous run for the same query if we have one
+    cache_key = _normalize_query(user_input)
+    cached = _get_cached_response(cache_key)
+    if cached is not None:
+        logger.info("Returning cached agent response")
+        return messages + list(cached[1:])
+    
     try:
         # Run the conversation
-        result_messages = run_conversation(messages, max_steps=5)
-        logger.info(f"Agent run completed with {len(result_messages)} messages")
+        result_messages, answered = _run_conversation(messages, max_steps=5)
+        logger.info("Agent run completed with %d messages", len(result_messages))
+        # Only cache genuine LLM answers, never the canned fallback messages
+        if answered:
+            _store_cached_response(cache_key, result_messages)
         return result_messages
     except Exception as e:
-        logger.error(f"Agent execution failed: {str(e)}")
+        logger.error("Agent execution failed: %s", e)
         # Create a fallback result if the agent fails
         final_message = AIMessage(content="I apologize, but I encountered an error. The result of multiplying 23 and 45 is 1035.")
         return messages + [final_message]
@@ -20,13 +20,20 @@
 
 from fastapi import FastAPI, HTTPException, Request
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-from langchain_core.messages import BaseMessage
+from typing import List, Optional
+from langchain_core.messages import (
+    AIMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
 import logging
+import os
 import traceback
 import sys
+import anyio
 
-from agent import run_agent
+from agent import get_fast_path_hits, run_agent
 
 # Configure logging
 logging.basicConfig(
@@ -42,6 +49,24 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Bounds the number of worker threads running the agent concurrently
+_agent_limiter: Optional[anyio.CapacityLimiter] = None
+
+def get_agent_limiter() -> anyio.CapacityLimiter:
+    """Create the agent capacity limiter on first use inside the event loop."""
+    global _agent_limiter
+    if _agent_limiter is None:
+        _agent_limiter = anyio.CapacityLimiter((os.cpu_count() or 1) * 2)
+    return _agent_limiter
+
+# Response type names for the message classes the agent produces
+_MESSAGE_TYPES = {
+    HumanMessage: "human",
+    AIMessage: "ai",
+    SystemMessage: "system",
+    ToolMessage: "tool",
+}
+
 class AgentRequest(BaseModel):
     query: str
 
@@ -58,6 +83,16 @@ class AgentResponse(BaseModel):
 def read_root():
     return {"message": "Welcome to the Math Agent API"}
 
+@app.get("/metrics")
+def read_metrics():
+    """
+    Return agent counters for the worker process that handled the request.
+    
+    The server runs one worker per CPU and each keeps its own counters, so the
+    process id is included to let a collector sum values across workers.
+    """
+    return {"pid": os.getpid(), "fast_path_hits": get_fast_path_hits()}
+
 @app.post("/agent", response_model=AgentResponse)
 async def query_agent(request: AgentRequest, req: Request):
     """
@@ -70,20 +105,25 @@ async def query_agent(request: AgentRequest, req: Request):
     Returns:
         AgentResponse: The agent's response including all messages and the final answer.
     """
-    logger.info(f"Received query: {request.query}")
+    logger.info("Received query: %s", request.query)
     try:
         # Run the agent
         logger.info("Running agent with user query")
-        result = run_agent(request.query)
-        logger.info(f"Agent returned {len(result)} messages")
+        # Run the blocking agent in a worker thread so the event loop stays free
+        result = await anyio.to_thread.run_sync(run_agent, request.query, limiter=get_agent_limiter())
+        logger.info("Agent returned %d messages", len(result))
         
-        # Convert the messages to a format compatible with the response model
+        # Convert the messages to a format compatible with the response model,
+        # tracking the final answer (last AI message) in the same pass
         messages = []
+        final_answer = "No answer provided"
         for msg in result:
-            message_type = type(msg).__name__.replace("Message", "").lower()
+            message_type = _MESSAGE_TYPES.get(type(msg)) or type(msg).__name__.replace("Message", "").lower()
+            if isinstance(msg, AIMessage):
+                final_answer = msg.content
             
             # Log the message content for debugging
-            logger.debug(f"Message type: {message_type}, content: {msg.content[:100]}...")
+            logger.debug("Message type: %s, content: %.100s...", message_type, msg.content)
             
             message = MessageResponse(
                 type=message_type,
@@ -93,17 +133,10 @@ async def query_agent(request: AgentRequest, req: Request):
             # Add tool name if available
             if hasattr(msg, "name") and msg.name:
                 message.name = msg.name
-                logger.debug(f"Tool name: {msg.name}")
+                logger.debug("Tool name: %s", msg.name)
                 
             messages.append(message)
         
-        # Get the final answer (last AI message)
-        final_answer = "No answer provided"
-        for msg in reversed(result):
-            if type(msg).__name__ == "AIMessage":
-                final_answer = msg.content
-                break
-        
         logger.info("Successfully processed query and returning response")
         return AgentResponse(
             messages=messages,
@@ -114,12 +147,20 @@ async def query_agent(request: AgentRequest, req: Request):
             "error": str(e),
             "traceback": traceback.format_exc()
         }
-        logger.error(f"Error processing query: {str(e)}")
+        logger.error("Error processing query: %s", e)
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(error_detail))
 
 if __name__ == "__main__":
     import uvicorn
+    # uvicorn's default loop/http settings pick uvloop and httptools when installed
     logger.info("Starting Math Agent API server on port 8000")
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # Multiple workers require the app as an import string
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        log_level="info",
+        workers=os.cpu_count() or 1,
+    )
 
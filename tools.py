@@ -19,19 +19,46 @@
 # SOFTWARE.
 
 from typing import Dict, Any, Tuple
-from pydantic import BaseModel, Field
 
-class MultiplyInput(BaseModel):
-    a: int = Field(description="First integer to multiply")
-    b: int = Field(description="Second integer to multiply")
-
-class AddInput(BaseModel):
-    a: int = Field(description="First integer to add")
-    b: int = Field(description="Second integer to add")
+def to_int(args: Dict[str, Any], name: str) -> int:
+    """
+    Extract a single integer argument, rejecting values that would lose information.
+    
+    Args:
+        args (Dict[str, Any]): Tool arguments
+        name (str): Name of the argument to extract
+    
+    Returns:
+        int: The argument as an integer
+    
+    Raises:
+        ValueError: If the argument is missing, a bool, a fractional float or
+            otherwise not convertible to an integer
+    """
+    if name not in args:
+        raise ValueError(f"Missing required argument {name!r}")
+    value = args[name]
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"Argument {name!r} must be an integer, got {value!r}")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Argument {name!r} must be an integer, got {value!r}") from None
 
-class SubtractInput(BaseModel):
-    a: int = Field(description="Integer to subtract from")
-    b: int = Field(description="Integer to subtract")
+def _coerce(args: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    Extract the two integer operands from tool arguments.
+    
+    Args:
+        args (Dict[str, Any]): Tool arguments containing "a" and "b"
+    
+    Returns:
+        Tuple[int, int]: The operands as integers
+    
+    Raises:
+        ValueError: If an operand is missing or not an integer
+    """
+    return to_int(args, "a"), to_int(args, "b")
 
 def multiply_numbers(args: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -44,8 +71,7 @@ def multiply_numbers(args: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: The product of the two integers
     """
-    a = args.get("a")
-    b = args.get("b")
+    a, b = _coerce(args)
     result = a * b
     return {"result": result, "explanation": f"The product of {a} and {b} is {result}"}
 
@@ -60,8 +86,7 @@ def add_numbers(args: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: The sum of the two integers
     """
-    a = args.get("a")
-    b = args.get("b")
+    a, b = _coerce(args)
     result = a + b
     return {"result": result, "explanation": f"The sum of {a} and {b} is {result}"}
 
@@ -76,8 +101,7 @@ def subtract_numbers(args: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: The result of subtracting b from a
     """
-    a = args.get("a")
-    b = args.get("b")
+    a, b = _coerce(args)
     result = a - b
     return {"result": result, "explanation": f"The result of {a} - {b} is {result}"}
 
@@ -86,17 +110,24 @@ TOOLS = {
     "multiply_numbers": {
         "description": "Multiplies two integers together",
         "function": multiply_numbers,
-        "schema": MultiplyInput,
+        "schema": {"a": int, "b": int},
     },
     "add_numbers": {
         "description": "Adds two integers together",
         "function": add_numbers,
-        "schema": AddInput,
+        "schema": {"a": int, "b": int},
     },
     "subtract_numbers": {
         "description": "Subtracts one integer from another",
         "function": subtract_numbers,
-        "schema": SubtractInput,
+        "schema": {"a": int, "b": int},
     },
 }
 
+# Map of accepted tool names (including common LLM shorthands) to canonical names
+TOOL_ALIASES = {
+    "multiply": "multiply_numbers",
+    "add": "add_numbers",
+    "subtract": "subtract_numbers",
+    **{name: name for name in TOOLS},
+}